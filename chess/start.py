@@ -1,4 +1,10 @@
+import bisect
 import copy
+import os
+import struct
+import sys
+import zlib
+from array import array
 
 # Future Enhancements & GUI Integration:
 # In upcoming iterations, we plan to expand this into a full-fledged chess game.
@@ -213,13 +219,74 @@ class Board:
         opponent_color = "black" if color == "white" else "white"
         return self.is_square_attacked(king_pos, opponent_color)
 
+    def apply_move(self, start_pos, end_pos, promotion=None):
+        """Move a piece without any validation (used when replaying trusted moves).
+
+        Castling is recognised by the king travelling two files, and
+        `promotion` is the piece class a pawn turns into, if any.
+        """
+        piece = self.grid[start_pos[0]][start_pos[1]]
+        if isinstance(piece, King) and abs(end_pos[1] - start_pos[1]) == 2:
+            rook_col, new_rook_col = (7, 5) if end_pos[1] > start_pos[1] else (0, 3)
+            rook = self.grid[start_pos[0]][rook_col]
+            self.grid[start_pos[0]][new_rook_col] = rook
+            self.grid[start_pos[0]][rook_col] = None
+            if rook:
+                rook.has_moved = True
+        if promotion is not None:
+            piece = promotion(piece.color)
+        piece.has_moved = True
+        self.grid[end_pos[0]][end_pos[1]] = piece
+        self.grid[start_pos[0]][start_pos[1]] = None
+
+    def encode(self):
+        """Pack the board into 64 bytes, one per square.
+
+        Bits 0-2 hold the piece type, bit 3 is set for black and bit 4 for
+        pieces that have already moved. Empty squares are 0.
+        """
+        data = bytearray(64)
+        for i in range(8):
+            for j in range(8):
+                piece = self.grid[i][j]
+                if piece:
+                    code = _PIECE_CODES[type(piece)]
+                    if piece.color == "black":
+                        code |= 0x08
+                    if piece.has_moved:
+                        code |= 0x10
+                    data[i * 8 + j] = code
+        return bytes(data)
+
+    @classmethod
+    def decode(cls, data):
+        """Rebuild a board from the output of `encode`."""
+        board = cls()
+        for i in range(8):
+            for j in range(8):
+                code = data[i * 8 + j]
+                if code == 0:
+                    board.grid[i][j] = None
+                    continue
+                piece = _CODE_PIECES[code & 0x07]("black" if code & 0x08 else "white")
+                piece.has_moved = bool(code & 0x10)
+                board.grid[i][j] = piece
+        return board
+
+
+# Compact piece codes shared by board snapshots and journaled promotions.
+_PIECE_CODES = {Pawn: 1, Rook: 2, Knight: 3, Bishop: 4, Queen: 5, King: 6}
+_CODE_PIECES = {code: piece_cls for piece_cls, code in _PIECE_CODES.items()}
+
 
 class Game:
     """Controls the game flow."""
-    def __init__(self):
+    def __init__(self, journal=None):
         self.board = Board()
         self.turn = "white"  # White moves first
         self.move_history = []
+        self.journal = journal  # Optional GameJournal persisting every move
+        self.game_id = journal.new_game() if journal else None
         self.vs_ai = False  # Flag to indicate playing against AI
         self.ai_color = None  # Which color the AI controls (if any)
         self.human_color = None  # The human player's chosen color (if vs_ai)
@@ -237,7 +304,7 @@ class Game:
                 continue
             move = input(f"{self.turn}'s move (e.g. 'e2 e4'): ")
             if self.process_move(move):
-                self.move_history.append(move)
+                self.record_move(move)
                 self.switch_turns()
 
     def launch_gui(self):
@@ -473,6 +540,28 @@ class Game:
         row = int(pos[1]) - 1
         return (row, col)
 
+    def record_move(self, move_str):
+        """Append an accepted move to the history and, if enabled, the journal.
+
+        Must be called after `process_move` has applied the move to the board.
+        """
+        ply = len(self.move_history)
+        self.move_history.append(move_str)
+        if self.journal is None:
+            return
+        start, end = move_str.split()
+        start_pos = self.algebraic_to_coords(start)
+        end_pos = self.algebraic_to_coords(end)
+        # A minor or major piece on the back rank is recorded as a promotion;
+        # for a piece that simply moved there, replaying it is a no-op.
+        piece = self.board.grid[end_pos[0]][end_pos[1]]
+        promotion = None
+        if end_pos[0] in (0, 7) and isinstance(piece, (Queen, Rook, Bishop, Knight)):
+            promotion = type(piece)
+        next_turn = "black" if self.turn == "white" else "white"
+        self.journal.record_move(self.game_id, ply, start_pos, end_pos, promotion,
+                                 self.board, next_turn)
+
     def switch_turns(self):
         """Switch turns between white and black."""
         self.turn = "black" if self.turn == "white" else "white"
@@ -522,7 +611,7 @@ class Game:
             
             # Process the move.
             if self.process_move(move_str):
-                self.move_history.append(move_str)
+                self.record_move(move_str)
                 self.switch_turns()
                 self.message_label.config(text=f"Move {src_alg} to {dst_alg} accepted. {self.turn.capitalize()}'s turn.")
             else:
@@ -576,6 +665,9 @@ class Game:
         self.move_history = []
         self.selected_square = None
         self.game_over_auto_reset_scheduled = False
+        if self.journal is not None:
+            # The finished game stays in the journal; continue under a new id.
+            self.game_id = self.journal.new_game()
         self.update_gui()
         if hasattr(self, 'message_label'):
             self.message_label.config(text="New game started. White's turn.")
@@ -620,7 +712,7 @@ class Game:
         move_str = random.choice(valid_moves)
         print(f"AI ({self.ai_color}) moves: {move_str}")
         self.process_move(move_str, ai_move=True)
-        self.move_history.append(move_str)
+        self.record_move(move_str)
         self.switch_turns()
         if hasattr(self, 'update_gui'):
             self.update_gui()
@@ -633,9 +725,338 @@ class Game:
             self.ai_move()
         self.window.after(500, self.check_ai)
 
+class _JournalEntry:
+    """In-memory index of one journaled game."""
+    def __init__(self):
+        self.moves = array("H")  # Encoded move per ply
+        self.snapshot_plies = []  # Sorted plies that have a stored snapshot
+        self.snapshot_offsets = []  # Log offset of each snapshot record
+
+    def truncate(self, ply):
+        """Forget moves from `ply` on (a takeback) and any snapshots beyond it."""
+        del self.moves[ply:]
+        keep = bisect.bisect_right(self.snapshot_plies, ply)
+        del self.snapshot_plies[keep:]
+        del self.snapshot_offsets[keep:]
+
+
+class GameJournal:
+    """Append-only binary log of every move of every game.
+
+    Each record is a small header (kind, game id, ply, payload length)
+    followed by its payload: 2 bytes per move and a 65 byte board snapshot
+    every `snapshot_interval` plies. Writes are buffered and flushed every
+    `batch_size` records; with `fsync=True` each flush is also fsynced.
+
+    An in-memory index maps game ids to their moves and snapshot offsets, so
+    a game is found in O(1) and any ply is rebuilt from the nearest snapshot.
+    The index is saved next to the log on `close()` and only the part of the
+    log written after it is rescanned on open. The index carries the log's
+    random id and a checksum; if either does not match, the whole log is
+    rescanned instead. A record cut short at the end of the log (e.g. after
+    a crash) is discarded; any other malformed record raises ValueError.
+
+    Recording a move at a ply that was already played truncates the game at
+    that ply, so resuming an earlier position and playing on works as a
+    takeback.
+    """
+
+    MAGIC = b"CHESSJ02"
+    INDEX_MAGIC = b"CHESSI02"
+    MOVE, SNAPSHOT, NEW_GAME = 1, 2, 3
+    _PAYLOAD_SIZES = {MOVE: 2, SNAPSHOT: 65, NEW_GAME: 0}
+    _LOG_HEADER = struct.Struct("<8s8s")  # magic, journal id
+    _HEADER = struct.Struct("<BIHH")  # kind, game id, ply, payload length
+    _MOVE = struct.Struct("<H")
+    # magic, journal id, log size covered, next id, game count, crc32 of the rest
+    _INDEX_HEADER = struct.Struct("<8s8sQIII")
+    _INDEX_GAME = struct.Struct("<IHH")  # game id, move count, snapshot count
+    _INDEX_SNAPSHOT = struct.Struct("<HQ")  # ply, log offset
+
+    def __init__(self, path, batch_size=64, fsync=False, snapshot_interval=16):
+        if snapshot_interval < 1:
+            raise ValueError("snapshot_interval must be at least 1.")
+        self.path = path
+        self.index_path = path + ".idx"
+        self.batch_size = batch_size
+        self.fsync = fsync
+        self.snapshot_interval = snapshot_interval
+        self.games = {}
+        self.next_game_id = 1
+        self._buffer = bytearray()
+        self._pending = 0
+
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            self._file = open(path, "r+b")
+            raw = self._file.read(self._LOG_HEADER.size)
+            if len(raw) < self._LOG_HEADER.size or raw[:len(self.MAGIC)] != self.MAGIC:
+                self._file.close()
+                raise ValueError(f"{path} is not a game journal.")
+            self._journal_id = self._LOG_HEADER.unpack(raw)[1]
+            self._size = os.path.getsize(path)
+            try:
+                self._scan(self._load_index())
+            except ValueError:
+                self._file.close()
+                raise
+        else:
+            self._journal_id = os.urandom(8)
+            self._file = open(path, "w+b")
+            self._file.write(self._LOG_HEADER.pack(self.MAGIC, self._journal_id))
+            self._size = self._LOG_HEADER.size
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __contains__(self, game_id):
+        return game_id in self.games
+
+    def new_game(self):
+        """Start journaling a new game and return its id."""
+        game_id = self.next_game_id
+        self._append(self.NEW_GAME, game_id, 0, b"")
+        return game_id
+
+    def record_move(self, game_id, ply, start_pos, end_pos, promotion, board, turn):
+        """Journal the move played at `ply`; `board` and `turn` are the position after it.
+
+        `ply` may not be past the end of the game. Raises ValueError, without
+        writing anything, for an unknown game or an out-of-range ply.
+        """
+        if game_id not in self.games:
+            raise ValueError(f"Unknown game {game_id}.")
+        if not 0 <= ply <= len(self.games[game_id].moves):
+            raise ValueError(f"Game {game_id} has no ply {ply} to record a move at.")
+        code = (start_pos[0] * 8 + start_pos[1]) | (end_pos[0] * 8 + end_pos[1]) << 6
+        if promotion is not None:
+            code |= _PIECE_CODES[promotion] << 12
+        self._append(self.MOVE, game_id, ply, self._MOVE.pack(code))
+        if (ply + 1) % self.snapshot_interval == 0:
+            payload = (b"\x01" if turn == "black" else b"\x00") + board.encode()
+            self._append(self.SNAPSHOT, game_id, ply + 1, payload)
+
+    def game_length(self, game_id):
+        """Number of plies journaled for a game."""
+        return len(self.games[game_id].moves)
+
+    def moves(self, game_id, ply=None):
+        """Return the game's moves in algebraic notation, up to `ply` if given."""
+        entry = self.games[game_id]
+        return [self._move_str(code) for code in entry.moves[:ply]]
+
+    def position(self, game_id, ply=None):
+        """Return (board, turn) after `ply` moves (default: the latest position).
+
+        Starts from the closest snapshot at or before `ply`, so at most
+        `snapshot_interval - 1` moves are replayed.
+        """
+        entry = self.games[game_id]
+        if ply is None:
+            ply = len(entry.moves)
+        if not 0 <= ply <= len(entry.moves):
+            raise ValueError(f"Game {game_id} has no ply {ply}.")
+        i = bisect.bisect_right(entry.snapshot_plies, ply) - 1
+        if i >= 0:
+            start = entry.snapshot_plies[i]
+            payload = self._read_payload(entry.snapshot_offsets[i])
+            board = Board.decode(payload[1:])
+            turn = "black" if payload[0] else "white"
+        else:
+            start = 0
+            board = Board()
+            turn = "white"
+        for code in entry.moves[start:ply]:
+            board.apply_move(*self._decode_move(code))
+            turn = "black" if turn == "white" else "white"
+        return board, turn
+
+    def resume(self, game_id, ply=None):
+        """Return a Game restored at `ply` that keeps journaling under `game_id`.
+
+        Once the returned game records a move, any other Game on the same id
+        is stale: its next move is rejected if it lies past the journaled end
+        of the game, and otherwise acts as a takeback from that ply.
+        """
+        game = Game()
+        game.board, game.turn = self.position(game_id, ply)
+        game.move_history = self.moves(game_id, ply)
+        game.journal = self
+        game.game_id = game_id
+        return game
+
+    def flush(self):
+        """Write buffered records to disk (and fsync if configured)."""
+        if self._buffer:
+            self._file.seek(self._size)
+            self._file.write(self._buffer)
+            self._size += len(self._buffer)
+            self._buffer.clear()
+            self._pending = 0
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+
+    def close(self):
+        """Flush the log, save the index and close the journal."""
+        if self._file.closed:
+            return
+        self.flush()
+        self._save_index()
+        self._file.close()
+
+    def _append(self, kind, game_id, ply, payload):
+        offset = self._size + len(self._buffer)
+        self._buffer += self._HEADER.pack(kind, game_id, ply, len(payload))
+        self._buffer += payload
+        self._index_record(kind, game_id, ply, payload, offset)
+        self._pending += 1
+        if self._pending >= self.batch_size:
+            self.flush()
+
+    def _index_record(self, kind, game_id, ply, payload, offset):
+        if kind == self.NEW_GAME:
+            self.games[game_id] = _JournalEntry()
+            self.next_game_id = max(self.next_game_id, game_id + 1)
+            return
+        entry = self.games[game_id]
+        if kind == self.MOVE:
+            entry.truncate(ply)
+            entry.moves.append(self._MOVE.unpack(payload)[0])
+        elif kind == self.SNAPSHOT:
+            entry.truncate(ply)
+            entry.snapshot_plies.append(ply)
+            entry.snapshot_offsets.append(offset)
+
+    def _read_payload(self, offset):
+        """Read the payload of the record at `offset`, flushed or not."""
+        if offset >= self._size:
+            start = offset - self._size
+            header = self._HEADER.unpack_from(self._buffer, start)
+            start += self._HEADER.size
+            return bytes(self._buffer[start:start + header[3]])
+        self._file.seek(offset)
+        header = self._HEADER.unpack(self._file.read(self._HEADER.size))
+        return self._file.read(header[3])
+
+    def _scan(self, offset):
+        """Index records from `offset` to the end, dropping a torn tail.
+
+        Only a record cut short by the end of the file counts as torn. Any
+        other malformed record means the saved index does not match the log,
+        so everything is rebuilt from the first record; if that still fails,
+        the log itself is corrupt and ValueError is raised.
+        """
+        start = offset
+        self._file.seek(offset)
+        while offset < self._size:
+            raw = self._file.read(self._HEADER.size)
+            if len(raw) < self._HEADER.size:
+                break
+            kind, game_id, ply, length = self._HEADER.unpack(raw)
+            payload = self._file.read(length)
+            if len(payload) < length:
+                break
+            if not self._is_valid_record(kind, game_id, ply, length):
+                if start > self._LOG_HEADER.size:
+                    self.games = {}
+                    self.next_game_id = 1
+                    self._scan(self._LOG_HEADER.size)
+                    return
+                raise ValueError(f"{self.path} has a corrupt record at offset {offset}.")
+            self._index_record(kind, game_id, ply, payload, offset)
+            offset += self._HEADER.size + length
+        if offset < self._size:
+            self._file.truncate(offset)
+            self._size = offset
+
+    def _is_valid_record(self, kind, game_id, ply, length):
+        if self._PAYLOAD_SIZES.get(kind) != length:
+            return False
+        if kind == self.NEW_GAME:
+            return game_id not in self.games
+        entry = self.games.get(game_id)
+        return entry is not None and ply <= len(entry.moves)
+
+    def _load_index(self):
+        """Load the saved index and return the log offset it covers.
+
+        Returns the offset of the first record (forcing a full rescan) if the
+        index is missing, truncated, corrupt or belongs to a different log.
+        The index file is deleted once read, whether or not it is used.
+        """
+        first_record = self._LOG_HEADER.size
+        try:
+            with open(self.index_path, "rb") as f:
+                data = f.read()
+            # close() writes a fresh index; until then a stale one on disk
+            # would hide records appended after this open.
+            os.remove(self.index_path)
+            magic, journal_id, covered, next_id, count, crc = \
+                self._INDEX_HEADER.unpack_from(data, 0)
+            pos = self._INDEX_HEADER.size
+            if (magic != self.INDEX_MAGIC or journal_id != self._journal_id
+                    or not first_record <= covered <= self._size
+                    or zlib.crc32(data[pos:]) != crc):
+                return first_record
+            games = {}
+            for _ in range(count):
+                game_id, n_moves, n_snapshots = self._INDEX_GAME.unpack_from(data, pos)
+                pos += self._INDEX_GAME.size
+                entry = _JournalEntry()
+                entry.moves.extend(struct.unpack_from(f"<{n_moves}H", data, pos))
+                pos += 2 * n_moves
+                for _ in range(n_snapshots):
+                    ply, snapshot_offset = self._INDEX_SNAPSHOT.unpack_from(data, pos)
+                    pos += self._INDEX_SNAPSHOT.size
+                    entry.snapshot_plies.append(ply)
+                    entry.snapshot_offsets.append(snapshot_offset)
+                games[game_id] = entry
+            if pos != len(data):
+                return first_record
+        except (OSError, struct.error, ValueError):
+            return first_record
+        self.games = games
+        self.next_game_id = next_id
+        return covered
+
+    def _save_index(self):
+        parts = []
+        for game_id, entry in self.games.items():
+            parts.append(self._INDEX_GAME.pack(game_id, len(entry.moves),
+                                               len(entry.snapshot_plies)))
+            parts.append(struct.pack(f"<{len(entry.moves)}H", *entry.moves))
+            for ply, offset in zip(entry.snapshot_plies, entry.snapshot_offsets):
+                parts.append(self._INDEX_SNAPSHOT.pack(ply, offset))
+        body = b"".join(parts)
+        header = self._INDEX_HEADER.pack(self.INDEX_MAGIC, self._journal_id, self._size,
+                                         self.next_game_id, len(self.games), zlib.crc32(body))
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(header + body)
+            if self.fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, self.index_path)
+
+    @staticmethod
+    def _decode_move(code):
+        start, end, promotion = code & 0x3F, (code >> 6) & 0x3F, code >> 12
+        return (start // 8, start % 8), (end // 8, end % 8), _CODE_PIECES.get(promotion)
+
+    @classmethod
+    def _move_str(cls, code):
+        start_pos, end_pos, _ = cls._decode_move(code)
+        return " ".join(f"{chr(c + ord('a'))}{r+1}" for r, c in (start_pos, end_pos))
+
+
 # If this script is run directly, start the game
 if __name__ == "__main__":
-    game = Game()
+    # Optionally journal every game: python start.py [journal_path]
+    journal = GameJournal(sys.argv[1]) if len(sys.argv) > 1 else None
+    game = Game(journal)
     mode = input("Select game mode - (1) CLI or (2) GUI: ").strip()
     ai_choice = input("Play against AI? (Y/N): ").strip().upper()
     if ai_choice == "Y":
@@ -648,7 +1069,11 @@ if __name__ == "__main__":
         # Ensure that white always starts; if you choose black, AI (white) starts.
         game.turn = "white"
         game.human_color = player_color
-    if mode == "2":
-        game.launch_gui()
-    else:
-        game.play()
+    try:
+        if mode == "2":
+            game.launch_gui()
+        else:
+            game.play()
+    finally:
+        if journal:
+            journal.close()
@@ -0,0 +1,205 @@
+import os
+
+import pytest
+
+from start import Game, GameJournal, Knight
+
+CASTLING = ["e2 e4", "e7 e5", "g1 f3", "b8 c6", "f1 c4", "g8 f6", "e1 g1"]
+PROMOTION = ["a2 a4", "b7 b5", "a4 b5", "a7 a6", "b5 a6", "c8 b7", "a6 b7", "h7 h6", "b7 a8"]
+
+
+def play(game, moves, positions=None):
+    """Play scripted moves, optionally collecting (board bytes, turn) after each."""
+    for move in moves:
+        assert game.process_move(move, suppress_output=True), move
+        game.record_move(move)
+        game.switch_turns()
+        if positions is not None:
+            positions.append((game.board.encode(), game.turn))
+
+
+def assert_positions(journal, game_id, positions):
+    for ply, expected in enumerate(positions, start=1):
+        board, turn = journal.position(game_id, ply)
+        assert (board.encode(), turn) == expected
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "games.bin")
+
+
+def test_interleaved_games_round_trip(path):
+    journal = GameJournal(path, batch_size=5, snapshot_interval=3)
+    first, second = Game(journal), Game(journal)
+    first_positions, second_positions = [], []
+    for a, b in zip(CASTLING, PROMOTION[:len(CASTLING)]):
+        play(first, [a], first_positions)
+        play(second, [b], second_positions)
+    assert_positions(journal, first.game_id, first_positions)
+    assert_positions(journal, second.game_id, second_positions)
+    journal.close()
+
+    for remove_index in (False, True):
+        if remove_index:
+            os.remove(path + ".idx")
+        with GameJournal(path) as reopened:
+            assert reopened.moves(first.game_id) == first.move_history
+            assert reopened.moves(second.game_id) == second.move_history
+            assert_positions(reopened, first.game_id, first_positions)
+            assert_positions(reopened, second.game_id, second_positions)
+
+
+def test_castling_and_promotion_replay(path, monkeypatch):
+    monkeypatch.setattr("builtins.input", lambda prompt="": "N")
+    with GameJournal(path, snapshot_interval=4) as journal:
+        castling, promotion = Game(journal), Game(journal)
+        play(castling, CASTLING)
+        play(promotion, PROMOTION)
+    with GameJournal(path) as journal:
+        board, turn = journal.position(castling.game_id)
+        assert board.encode() == castling.board.encode()
+        assert turn == "black"
+        board, _ = journal.position(promotion.game_id)
+        assert isinstance(board.grid[7][0], Knight)
+        assert board.encode() == promotion.board.encode()
+
+
+def test_resume_and_takeback(path):
+    with GameJournal(path, snapshot_interval=2) as journal:
+        game = Game(journal)
+        play(game, CASTLING)
+        resumed = journal.resume(game.game_id, 3)
+        assert resumed.turn == "black"
+        assert resumed.move_history == CASTLING[:3]
+        play(resumed, ["d7 d6"])
+        assert journal.moves(game.game_id) == CASTLING[:3] + ["d7 d6"]
+    with GameJournal(path) as journal:
+        assert journal.moves(game.game_id) == CASTLING[:3] + ["d7 d6"]
+        assert journal.position(game.game_id)[0].encode() == resumed.board.encode()
+
+
+def test_torn_tail_is_dropped(path):
+    journal = GameJournal(path)
+    game = Game(journal)
+    play(game, CASTLING[:4])
+    journal.flush()
+    size = os.path.getsize(path)
+    journal._file.write(b"\x01\x01\x00")  # Crash midway through a record header
+    journal._file.flush()
+
+    with GameJournal(path) as reopened:
+        assert os.path.getsize(path) == size
+        assert reopened.moves(game.game_id) == CASTLING[:4]
+
+
+def test_truncated_index_is_rebuilt(path):
+    with GameJournal(path) as journal:
+        game = Game(journal)
+        play(game, CASTLING[:4])
+    with open(path + ".idx", "r+b") as f:
+        f.truncate(os.path.getsize(path + ".idx") - 4)
+
+    with GameJournal(path) as journal:
+        assert journal.moves(game.game_id) == CASTLING[:4]
+
+
+def test_index_from_deleted_log_is_ignored(path):
+    with GameJournal(path) as journal:
+        play(Game(journal), ["e2 e4", "d7 d5", "c2 c4"])
+    os.remove(path)
+
+    journal = GameJournal(path)
+    game = Game(journal)
+    play(game, ["e2 e4", "e7 e5"])
+    journal.flush()  # Crash before close(), leaving the old index in place
+
+    with GameJournal(path) as reopened:
+        assert reopened.moves(game.game_id) == ["e2 e4", "e7 e5"]
+
+
+def test_corrupt_record_raises_without_truncating(path):
+    with GameJournal(path) as journal:
+        play(Game(journal), CASTLING[:2])
+    os.remove(path + ".idx")
+    size = os.path.getsize(path)
+    with open(path, "r+b") as f:
+        f.seek(GameJournal._LOG_HEADER.size)
+        f.write(b"\x09")  # Unknown record kind
+
+    with pytest.raises(ValueError):
+        GameJournal(path)
+    assert os.path.getsize(path) == size
+
+
+def test_contains(path):
+    with GameJournal(path) as journal:
+        game = Game(journal)
+        assert game.game_id in journal
+        assert game.game_id + 1 not in journal
+
+
+def test_snapshot_interval_must_be_positive(path):
+    with pytest.raises(ValueError):
+        GameJournal(path, snapshot_interval=0)
+
+
+def test_unknown_game_is_rejected_without_writing(path):
+    with GameJournal(path) as journal:
+        game = Game(journal)
+        play(game, CASTLING[:2])
+        with pytest.raises(ValueError):
+            journal.record_move(99, 0, (1, 4), (3, 4), None, game.board, "black")
+    os.remove(path + ".idx")
+
+    with GameJournal(path) as reopened:
+        assert reopened.moves(game.game_id) == CASTLING[:2]
+        assert 99 not in reopened
+
+
+def test_ply_past_end_is_rejected_without_writing(path):
+    with GameJournal(path) as journal:
+        game = Game(journal)
+        play(game, CASTLING[:2])
+        with pytest.raises(ValueError):
+            journal.record_move(game.game_id, 3, (0, 6), (2, 5), None, game.board, "black")
+    os.remove(path + ".idx")
+
+    with GameJournal(path) as reopened:
+        assert reopened.moves(game.game_id) == CASTLING[:2]
+
+
+def test_stale_game_after_resume_is_rejected(path):
+    with GameJournal(path) as journal:
+        original = Game(journal)
+        play(original, CASTLING[:4])
+        resumed = journal.resume(original.game_id, 1)
+        play(resumed, ["d7 d5"])
+        with pytest.raises(ValueError):
+            play(original, CASTLING[4:5])
+        assert journal.moves(original.game_id) == ["e2 e4", "d7 d5"]
+    os.remove(path + ".idx")
+
+    with GameJournal(path) as reopened:
+        assert reopened.moves(original.game_id) == ["e2 e4", "d7 d5"]
+        assert reopened.position(original.game_id)[0].encode() == resumed.board.encode()
+
+
+def test_rejected_index_is_not_trusted_after_crash(path):
+    with GameJournal(path) as journal:
+        first = Game(journal)
+        play(first, CASTLING[:6])
+    move_record = GameJournal._HEADER.size + GameJournal._MOVE.size
+    with open(path, "r+b") as f:
+        f.truncate(os.path.getsize(path) - 3 * move_record)
+
+    journal = GameJournal(path)  # Index covers more than the log: rejected
+    assert journal.moves(first.game_id) == CASTLING[:3]
+    second = Game(journal)
+    play(second, ["d2 d4", "d7 d5", "c2 c4", "e7 e6"])  # Writes past the old index
+    journal.flush()
+    journal._file.close()  # Crash before close()
+
+    with GameJournal(path) as reopened:
+        assert reopened.moves(first.game_id) == CASTLING[:3]
+        assert reopened.moves(second.game_id) == ["d2 d4", "d7 d5", "c2 c4", "e7 e6"]